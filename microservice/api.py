@@ -1,32 +1,170 @@
-from pydantic import BaseModel
-from fastapi import FastAPI, Depends
+from functools import lru_cache
+from typing import Annotated, Literal
+from uuid import UUID, uuid4
+import msgspec
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
 from sqlmodel import Session
 from microservice.db.engine import create_tables, get_session
-from microservice.db.models import Workflow
+from microservice.db.models import Component, ComponentTypeEnum, Workflow
 
 app = FastAPI()
 
+# plain strings rather than `ComponentTypeEnum`, msgspec validates `Literal`
+# without going through the enum machinery; values must match the enum so the
+# API and the DB column accept the same types (checked in the tests)
+ComponentType = Literal["import", "shadow", "crop", "export"]
+IMPORT = ComponentTypeEnum.IMPORT.value
+EXPORT = ComponentTypeEnum.EXPORT.value
+
 
 @app.on_event("startup")
 def start_db():
     create_tables()
 
-# TODO: add list of components with `type` and `settings` fields to the request
 
+@app.exception_handler(msgspec.DecodeError)
+async def validation_exception_handler(request: Request, exc: msgspec.DecodeError):
+    # `msgspec.ValidationError` subclasses `DecodeError`, so malformed JSON and
+    # schema violations both end up here, like FastAPI's own 422 handler
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
+# the rules only depend on the sequence of `(type, has_settings)` pairs, so the
+# result is cached on it; the error is returned, not raised, since `lru_cache`
+# does not cache exceptions. `WorkflowSchema` caps the list length, so keys
+# stay small and few
+@lru_cache(maxsize=256)
+def check_components_shape(shape: tuple[tuple[str, bool], ...]) -> str | None:
+    seen_types = set()
+    duplicates = set()
+    import_index = export_index = None
+    any_settings = False
+    all_settings = True
+    for i, (component_type, has_settings) in enumerate(shape):
+        if component_type in seen_types:
+            duplicates.add(component_type)
+        seen_types.add(component_type)
+        if component_type == IMPORT:
+            import_index = i
+        elif component_type == EXPORT:
+            export_index = i
+        any_settings |= has_settings
+        all_settings &= has_settings
+
+    if duplicates:
+        return f"duplicated component types: {sorted(duplicates)}"
+    if import_index is not None and import_index != 0:
+        return "`import` component must be first"
+    if export_index is not None and export_index != len(shape) - 1:
+        return "`export` component must be last"
+    if any_settings and not all_settings:
+        return "either all components or none must have `settings`"
+    return None
+
+
+# orjson, which serializes the settings column, only handles 64-bit integers
+# (msgspec bounds must themselves fit in an int64)
+SettingInt = Annotated[int, msgspec.Meta(ge=-2**63, le=2**63 - 1)]
 
-class WorkflowSchema(BaseModel):
+
+class ComponentSchema(msgspec.Struct, frozen=True):
+    type: ComponentType
+    settings: dict[str, SettingInt | float | str | bool] | None = None
+
+
+class WorkflowSchema(msgspec.Struct):
     name: str
+    # duplicates are rejected, so a valid list holds at most one of each type
+    components: Annotated[
+        list[ComponentSchema], msgspec.Meta(max_length=len(ComponentTypeEnum))
+    ] = []
 
+    def __post_init__(self):
+        if not self.components:
+            return
+        # errors raised here are re-raised by msgspec as `ValidationError`
+        error = check_components_shape(
+            tuple((c.type, c.settings is not None) for c in self.components)
+        )
+        if error is not None:
+            raise ValueError(error)
+
+
+class ValidationErrorSchema(msgspec.Struct):
+    detail: str
 
-@app.post("/workflow")
-def create_workflow(
-        request: WorkflowSchema,
-        session: Session = Depends(get_session)
 
-):
-    # TODO: validate and store components
-    workflow_db = Workflow(name=request.name)
-    session.add(workflow_db)
+_workflow_decoder = msgspec.json.Decoder(WorkflowSchema)
+
+# the body is decoded by msgspec rather than FastAPI, so its schemas are
+# generated with msgspec and registered in the OpenAPI components by hand
+(_workflow_schema_ref, _validation_error_schema_ref), _schema_components = (
+    msgspec.json.schema_components(
+        [WorkflowSchema, ValidationErrorSchema],
+        ref_template="#/components/schemas/{name}",
+    )
+)
+
+
+def openapi():
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(
+            _schema_components
+        )
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
+
+def save_workflow(session: Session, workflow: WorkflowSchema) -> UUID:
+    # ids are generated here so that workflow and components can be written
+    # with plain INSERTs (one executemany for all components), no refresh needed
+    workflow_id = uuid4()
+    session.execute(insert(Workflow).values(id=workflow_id, name=workflow.name))
+    if workflow.components:
+        session.execute(
+            insert(Component),
+            [
+                {
+                    "id": uuid4(),
+                    "workflow_id": workflow_id,
+                    "position": i,
+                    "type": ComponentTypeEnum(c.type),
+                    "settings": c.settings,
+                }
+                for i, c in enumerate(workflow.components)
+            ],
+        )
     session.commit()
-    session.refresh(workflow_db)
-    return workflow_db.id
+    return workflow_id
+
+
+@app.post(
+    "/workflow",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _workflow_schema_ref}},
+            "required": True,
+        },
+        "responses": {
+            "422": {
+                "description": "Validation Error",
+                "content": {"application/json": {"schema": _validation_error_schema_ref}},
+            },
+        },
+    },
+)
+async def create_workflow(
+        request: Request,
+        session: Session = Depends(get_session)
+
+) -> UUID:
+    body = await request.body()
+    workflow = _workflow_decoder.decode(body)
+    # the session is synchronous, keep its blocking I/O off the event loop
+    return await run_in_threadpool(save_workflow, session, workflow)
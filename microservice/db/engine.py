@@ -1,3 +1,5 @@
+import orjson
+from sqlalchemy import event
 from sqlmodel import SQLModel, create_engine, Session
 from sqlmodel.pool import StaticPool
 
@@ -5,14 +7,36 @@ from sqlmodel.pool import StaticPool
 engine = None
 
 
+def _json_serializer(obj) -> str:
+    # orjson produces bytes, DB drivers expect text for JSON columns
+    return orjson.dumps(obj).decode()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL only needs to fsync on checkpoints rather than on every commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 def get_engine(test=False):
     if test:
         engine = create_engine(
-            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
         SQLModel.metadata.create_all(engine)
     else:
-        engine = create_engine(url="sqlite:///microservice.db")
+        engine = create_engine(
+            url="sqlite:///microservice.db",
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     return engine
 
 
@@ -1,5 +1,15 @@
+from enum import Enum
+from typing import Optional
 from uuid import uuid4, UUID
-from sqlmodel import Field, SQLModel
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, Relationship, SQLModel
+
+
+class ComponentTypeEnum(str, Enum):
+    IMPORT = "import"
+    SHADOW = "shadow"
+    CROP = "crop"
+    EXPORT = "export"
 
 
 class Workflow(SQLModel, table=True):
@@ -10,5 +20,21 @@ class Workflow(SQLModel, table=True):
         nullable=False,
     )
     name: str
+    components: list["Component"] = Relationship(
+        back_populates="workflow",
+        sa_relationship_kwargs={"order_by": "Component.position"},
+    )
 
-# TODO: add tables for `Component` and `Settings`
+
+class Component(SQLModel, table=True):
+    id: UUID = Field(
+        default_factory=uuid4,
+        primary_key=True,
+        index=True,
+        nullable=False,
+    )
+    workflow_id: UUID = Field(foreign_key="workflow.id", index=True, nullable=False)
+    position: int
+    type: ComponentTypeEnum
+    settings: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    workflow: Workflow = Relationship(back_populates="components")
@@ -1,10 +1,11 @@
+from typing import get_args
 from unittest import TestCase
 from assertpy import assert_that
 from fastapi.testclient import TestClient
 from microservice.db.engine import get_test_session, get_session
 
-from microservice.api import app
-from microservice.db.models import Workflow
+from microservice.api import ComponentType, app, check_components_shape
+from microservice.db.models import ComponentTypeEnum, Workflow
 
 
 class TestAPI(TestCase):
@@ -35,4 +36,178 @@ class TestAPI(TestCase):
             assert_that(str(wf.id)).is_equal_to(workflow_id)
             assert_that(wf.name).is_equal_to(given_workflow["name"])
 
-    # TODO: test components support and validation
+    def test_should_create_workflow_with_components(self):
+        given_workflow = {
+            "name": "test",
+            "components": [
+                {"type": "import", "settings": {"format": "PNG", "downscale": True}},
+                {"type": "shadow", "settings": {"intensity": 0.1}},
+                {"type": "export", "settings": {"quality": 90}},
+            ],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(200)
+        workflow_id = response.json()
+        assert_that(workflow_id).is_instance_of(str)
+
+        with next(get_test_session()) as session:
+            wf = session.get(Workflow, workflow_id)
+            assert_that([c.type for c in wf.components]).is_equal_to(
+                [c["type"] for c in given_workflow["components"]]
+            )
+            assert_that([c.settings for c in wf.components]).is_equal_to(
+                [c["settings"] for c in given_workflow["components"]]
+            )
+
+    def test_should_reject_unknown_component_type(self):
+        given_workflow = {"name": "test", "components": [{"type": "blur"}]}
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("components[0].type")
+
+    def test_should_reject_invalid_setting_value(self):
+        given_workflow = {
+            "name": "test",
+            "components": [{"type": "crop", "settings": {"box": [0, 0, 10, 10]}}],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+
+    def test_should_reject_out_of_range_integer_setting(self):
+        given_workflow = {
+            "name": "test",
+            "components": [{"type": "crop", "settings": {"a": 2**64}}],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("settings")
+
+    def test_should_reject_duplicated_component_types(self):
+        given_workflow = {
+            "name": "test",
+            "components": [{"type": "shadow"}, {"type": "crop"}, {"type": "shadow"}],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("duplicated")
+
+    def test_should_reject_import_not_first(self):
+        given_workflow = {
+            "name": "test",
+            "components": [{"type": "shadow"}, {"type": "import"}],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("`import`")
+
+    def test_should_reject_export_not_last(self):
+        given_workflow = {
+            "name": "test",
+            "components": [{"type": "export"}, {"type": "crop"}],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("`export`")
+
+    def test_should_reject_partial_settings(self):
+        given_workflow = {
+            "name": "test",
+            "components": [
+                {"type": "import", "settings": {"format": "PNG"}},
+                {"type": "export"},
+            ],
+        }
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("`settings`")
+
+    def test_should_reject_too_many_components(self):
+        given_workflow = {"name": "test", "components": [{"type": "crop"}] * 5}
+
+        response = self.client.post(
+            "/workflow/", json=given_workflow
+        )
+
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(response.json()["detail"]).contains("length <= 4")
+
+    def test_should_give_same_result_for_repeated_component_shapes(self):
+        invalid_workflow = {
+            "name": "test",
+            "components": [{"type": "crop"}, {"type": "import"}],
+        }
+        valid_workflow = {
+            "name": "test",
+            "components": [{"type": "import"}, {"type": "crop"}],
+        }
+
+        hits_before = check_components_shape.cache_info().hits
+        invalid_responses = [
+            self.client.post("/workflow/", json=invalid_workflow) for _ in range(2)
+        ]
+        valid_responses = [
+            self.client.post("/workflow/", json=valid_workflow) for _ in range(2)
+        ]
+
+        for response in invalid_responses:
+            assert_that(response.status_code).is_equal_to(422)
+        assert_that(invalid_responses[1].json()["detail"]).is_equal_to(
+            invalid_responses[0].json()["detail"]
+        )
+        for response in valid_responses:
+            assert_that(response.status_code).is_equal_to(200)
+        assert_that(check_components_shape.cache_info().hits - hits_before).is_equal_to(2)
+
+    def test_should_document_request_body_and_validation_error(self):
+        response = self.client.get("/openapi.json")
+
+        assert_that(response.status_code).is_equal_to(200)
+        openapi = response.json()
+        operation = openapi["paths"]["/workflow"]["post"]
+        assert_that(operation["requestBody"]["content"]["application/json"]["schema"]).is_equal_to(
+            {"$ref": "#/components/schemas/WorkflowSchema"}
+        )
+        assert_that(operation["responses"]).contains_key("422")
+        assert_that(openapi["components"]["schemas"]).contains_key(
+            "WorkflowSchema", "ComponentSchema", "ValidationErrorSchema"
+        )
+
+
+class TestComponentType(TestCase):
+
+    def test_literal_should_match_enum(self):
+        assert_that(set(get_args(ComponentType))).is_equal_to(
+            {t.value for t in ComponentTypeEnum}
+        )